@@ -4,6 +4,13 @@ import uvicorn
 
 from .config import get_config
 
+try:
+    import uvloop  # noqa: F401
+except ImportError:  # uvloop is not available on Windows
+    LOOP = "asyncio"
+else:
+    LOOP = "uvloop"
+
 
 def main() -> None:
     config = get_config()
@@ -12,6 +19,9 @@ def main() -> None:
         host="0.0.0.0",
         port=config.web_port,
         reload=False,
+        loop=LOOP,
+        http="httptools",
+        ws="websockets",
     )
 
 
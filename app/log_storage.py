@@ -1,60 +1,164 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import contextlib
+import itertools
+import logging
+import os
 from collections import deque
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING, Deque, Dict, List, Optional, TextIO
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+import orjson
 
 from .config import AppConfig
+from .telegram_notifier import NullTelegramNotifier
 
 if TYPE_CHECKING:
     from .telegram_notifier import TelegramNotifier
 
+logger = logging.getLogger(__name__)
+
+# Pending file output is written out once it grows past this size or when the
+# periodic flush timer fires, whichever comes first.
+FLUSH_THRESHOLD_BYTES = 64 * 1024
+FLUSH_INTERVAL_SECONDS = 0.1
+
+# UDP lines wait here for the single ingest consumer, which hands them to
+# add_entries_batch in groups of up to INGEST_BATCH_SIZE.
+INGEST_QUEUE_SIZE = 10_000
+INGEST_BATCH_SIZE = 256
+# Lines dropped on a full ingest queue are counted and reported at most once
+# per this many seconds.
+DROP_REPORT_INTERVAL_SECONDS = 10.0
+
+_fdatasync = getattr(os, "fdatasync", os.fsync)
 
-@dataclass
+
+def _format_line(iso_ts: str, message: str) -> bytes:
+    # a single f-string plus one encode() is the cheapest way CPython has to
+    # build the line; concatenating separately encoded pieces is slower
+    return f"[{iso_ts}] {message}\n".encode("utf-8")
+
+
+@dataclass(slots=True, frozen=True)
 class LogEntry:
     timestamp: datetime
     message: str
+    iso_ts: str = field(init=False)
+    _json_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # timestamps are always created in UTC, so no astimezone() is needed;
+        # cached fields are set with object.__setattr__ as the entry is frozen
+        object.__setattr__(self, "iso_ts", self.timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z")
+
+    @property
+    def iso_ts_short(self) -> str:
+        # "DD/MM HH:MM:SS", sliced out of iso_ts rather than another strftime
+        iso_ts = self.iso_ts
+        return f"{iso_ts[8:10]}/{iso_ts[5:7]} {iso_ts[11:19]}"
 
     def to_dict(self) -> Dict[str, str]:
-        return {
-            "timestamp": self.timestamp.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
-            "message": self.message,
-        }
+        return {"timestamp": self.iso_ts, "message": self.message}
+
+    def as_json_bytes(self) -> bytes:
+        # serialized once and shared by every websocket subscriber
+        if self._json_cache is None:
+            object.__setattr__(self, "_json_cache", orjson.dumps(self.to_dict()))
+        return self._json_cache
 
 
 class LogStorage:
     def __init__(self, config: AppConfig, telegram_notifier: Optional[TelegramNotifier] = None):
         self._config = config
         self._buffer: Deque[LogEntry] = deque(maxlen=config.max_memory_logs)
-        self._lock = asyncio.Lock()
-        self._listeners: List[asyncio.Queue[LogEntry]] = []
+        # copy-on-write: subscribe/unsubscribe swap in a new tuple so the
+        # per-entry fan-out can iterate it without copying
+        self._listeners: Tuple[asyncio.Queue[LogEntry], ...] = ()
         self._log_dir = Path(config.log_dir)
         self._log_dir.mkdir(parents=True, exist_ok=True)
-        self._current_log_file: Optional[Path] = None
-        self._file_handle: Optional[TextIO] = None
-        self._telegram_notifier = telegram_notifier
+        self._current_ordinal = -1
+        # (date ordinal, path) of daily log files kept sorted oldest first;
+        # seeded from disk once and extended on rotation so cleanup never has
+        # to rescan
+        self._rotation_history: Deque[Tuple[int, Path]] = deque()
+        if config.write_to_file:
+            self._rotation_history.extend(self._scan_log_files())
+        self._file_fd: Optional[int] = None
+        self._pending = bytearray()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._ingest_queue: asyncio.Queue[str] = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+        self._drain_task: Optional[asyncio.Task] = None
+        self._dropped = 0
+        self._drop_reported_at = float("-inf")
+        self._telegram_notifier: TelegramNotifier | NullTelegramNotifier = (
+            telegram_notifier or NullTelegramNotifier()
+        )
+
+    async def start(self) -> None:
+        self._drain_task = asyncio.create_task(self._drain_loop())
+        if self._config.write_to_file:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def enqueue(self, message: str) -> None:
+        try:
+            self._ingest_queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # drop input we cannot keep up with; reported from _drain_loop
+            self._dropped += 1
 
     async def add_entry(self, message: str) -> LogEntry:
-        entry = LogEntry(timestamp=datetime.now(timezone.utc), message=message.rstrip("\n"))
-        async with self._lock:
-            self._buffer.append(entry)
-            await self._notify(entry)
-            if self._config.write_to_file:
+        entries = await self.add_entries_batch([message])
+        return entries[0]
+
+    async def add_entries_batch(self, messages: List[str]) -> List[LogEntry]:
+        entries = [
+            LogEntry(timestamp=datetime.now(timezone.utc), message=message.rstrip("\n")) for message in messages
+        ]
+        # Everything below up to the Telegram hand-off is synchronous, so it
+        # runs without interruption on the event loop and needs no lock.
+        self._buffer.extend(entries)
+        for entry in entries:
+            self._notify(entry)
+        if self._config.write_to_file:
+            for entry in entries:
                 self._write_to_file(entry)
-        
-        # Send to Telegram if enabled
-        if self._telegram_notifier:
-            timestamp_str = entry.timestamp.strftime("%d/%m %H:%M:%S")
-            telegram_message = f"<code>[{timestamp_str}]</code> {entry.message}"
-            await self._telegram_notifier.send_message(telegram_message)
-        
-        return entry
-
-    async def _notify(self, entry: LogEntry) -> None:
-        for queue in list(self._listeners):
+
+        # Send to Telegram if enabled; formatting happens in the notifier worker
+        enqueue = self._telegram_notifier.enqueue
+        for entry in entries:
+            enqueue(entry)
+
+        return entries
+
+    def _report_dropped(self) -> None:
+        if not self._dropped:
+            return
+        logger.warning(f"Ingest queue is full, dropped {self._dropped} log lines")
+        self._dropped = 0
+
+    async def _drain_loop(self) -> None:
+        queue = self._ingest_queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < INGEST_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self.add_entries_batch(batch)
+            except Exception as e:
+                # keep ingesting; only this batch is affected
+                logger.error(f"Error storing log batch: {e}")
+            if self._dropped and loop.time() - self._drop_reported_at >= DROP_REPORT_INTERVAL_SECONDS:
+                self._report_dropped()
+                self._drop_reported_at = loop.time()
+
+    def _notify(self, entry: LogEntry) -> None:
+        for queue in self._listeners:
             try:
                 queue.put_nowait(entry)
             except asyncio.QueueFull:
@@ -63,50 +167,100 @@ class LogStorage:
 
     async def subscribe(self, max_queue_size: int = 1000) -> asyncio.Queue[LogEntry]:
         queue: asyncio.Queue[LogEntry] = asyncio.Queue(maxsize=max_queue_size)
-        async with self._lock:
-            self._listeners.append(queue)
+        self._listeners = self._listeners + (queue,)
         return queue
 
     async def unsubscribe(self, queue: asyncio.Queue[LogEntry]) -> None:
-        async with self._lock:
-            if queue in self._listeners:
-                self._listeners.remove(queue)
+        self._listeners = tuple(listener for listener in self._listeners if listener is not queue)
 
     async def get_recent(self, limit: int) -> List[Dict[str, str]]:
-        async with self._lock:
-            items = list(self._buffer)[-limit:]
-        return [item.to_dict() for item in items]
+        # walk from the newest end so only `limit` entries are touched
+        items = list(itertools.islice(reversed(self._buffer), limit))
+        return [item.to_dict() for item in reversed(items)]
 
     async def clear_buffer(self) -> None:
-        async with self._lock:
-            self._buffer.clear()
+        self._buffer.clear()
 
     def _write_to_file(self, entry: LogEntry) -> None:
-        log_path = self._get_log_file_path(entry.timestamp)
-        if self._current_log_file != log_path:
-            self._rotate_log_file(log_path)
-        if self._file_handle:
-            timestamp = entry.timestamp.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
-            self._file_handle.write(f"[{timestamp}] {entry.message}\n")
-            self._file_handle.flush()
+        ordinal = entry.timestamp.toordinal()
+        if ordinal != self._current_ordinal:
+            self._rotate_log_file(self._get_log_file_path(entry.timestamp), ordinal)
+            self._current_ordinal = ordinal
+        if self._file_fd is not None:
+            self._pending += _format_line(entry.iso_ts, entry.message)
+            if len(self._pending) > FLUSH_THRESHOLD_BYTES:
+                self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+        if self._file_fd is not None:
+            # One append per flush interval (or per 64 KB) is all the file path
+            # issues, so a plain write() is used rather than an io_uring ring.
+            written = 0
+            with memoryview(self._pending) as view:
+                try:
+                    while written < len(view):
+                        written += os.write(self._file_fd, view[written:])
+                except OSError as e:
+                    # drop what could not be written so the buffer cannot grow
+                    # without bound while the file is unwritable
+                    logger.error(f"Failed to write log file, dropped {len(view) - written} bytes: {e}")
+        self._pending.clear()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            self._flush_pending()
 
     def _get_log_file_path(self, timestamp: datetime) -> Path:
-        filename = timestamp.astimezone(timezone.utc).strftime("%Y-%m-%d.log")
+        filename = f"{timestamp.year:04d}-{timestamp.month:02d}-{timestamp.day:02d}.log"
         return self._log_dir / filename
 
-    def _rotate_log_file(self, new_path: Path) -> None:
-        if self._file_handle:
-            self._file_handle.close()
-            self._file_handle = None
-        self._current_log_file = new_path
+    def _rotate_log_file(self, new_path: Path, ordinal: int) -> None:
+        self._flush_pending()
+        if self._file_fd is not None:
+            os.close(self._file_fd)
+            self._file_fd = None
         new_path.parent.mkdir(parents=True, exist_ok=True)
-        self._file_handle = new_path.open("a", encoding="utf-8")
+        self._file_fd = os.open(new_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # insert in order: the clock may step backwards, or a future-dated file
+        # may have been found at startup
+        if not any(path == new_path for _, path in self._rotation_history):
+            bisect.insort(self._rotation_history, (ordinal, new_path))
 
     async def close(self) -> None:
-        async with self._lock:
-            if self._file_handle:
-                self._file_handle.close()
-                self._file_handle = None
+        if self._drain_task:
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Ingest task failed: {e}")
+            self._drain_task = None
+        remaining: List[str] = []
+        while not self._ingest_queue.empty():
+            remaining.append(self._ingest_queue.get_nowait())
+        if remaining:
+            try:
+                await self.add_entries_batch(remaining)
+            except Exception as e:
+                logger.error(f"Error storing log batch: {e}")
+        self._report_dropped()
+        if self._flush_task:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        self._flush_pending()
+        if self._file_fd is not None:
+            try:
+                _fdatasync(self._file_fd)
+            except OSError as e:
+                logger.error(f"Failed to sync log file: {e}")
+            os.close(self._file_fd)
+            self._file_fd = None
 
     async def cleanup_files(self) -> None:
         if not self._config.write_to_file:
@@ -114,14 +268,32 @@ class LogStorage:
         if self._config.keep_days <= 0:
             return
         cutoff = datetime.now(timezone.utc).date().toordinal() - self._config.keep_days
+        history = self._rotation_history
+        failed: List[Tuple[int, Path]] = []
+        while history and history[0][0] < cutoff:
+            item = history.popleft()
+            try:
+                item[1].unlink(missing_ok=True)
+            except OSError:
+                # keep it so the next cleanup retries
+                failed.append(item)
+        history.extendleft(reversed(failed))
+
+    def _scan_log_files(self) -> List[Tuple[int, Path]]:
+        files = []
         for file in self._log_dir.glob("*.log"):
+            # names are YYYY-MM-DD, so the date is read straight from the digits
+            stem = file.stem
+            if len(stem) != 10 or stem[4] != "-" or stem[7] != "-":
+                continue
+            # int() alone would also accept "+1", "1_" or " 1"
+            digits = stem[0:4] + stem[5:7] + stem[8:10]
+            if not (digits.isascii() and digits.isdigit()):
+                continue
             try:
-                date_part = file.stem
-                file_date = datetime.strptime(date_part, "%Y-%m-%d").date()
+                file_date = date(int(stem[0:4]), int(stem[5:7]), int(stem[8:10]))
             except ValueError:
                 continue
-            if file_date.toordinal() < cutoff:
-                try:
-                    file.unlink(missing_ok=True)
-                except OSError:
-                    continue
+            files.append((file_date.toordinal(), file))
+        files.sort()
+        return files
@@ -6,7 +6,7 @@ from typing import AsyncIterator
 
 from fastapi import Depends, FastAPI, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from .config import AppConfig, get_config
@@ -17,6 +17,9 @@ from .udp_listener import start_udp_server
 
 CONFIG = get_config()
 
+# Maximum number of queued entries combined into a single websocket frame.
+WEBSOCKET_BATCH_SIZE = 64
+
 
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     config = CONFIG
@@ -27,6 +30,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     
     # Initialize storage with Telegram notifier
     storage = LogStorage(config, telegram_notifier)
+    await storage.start()
 
     app.state.config = config
     app.state.storage = storage
@@ -51,7 +55,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         await asyncio.sleep(0)
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CONFIG.allowed_origins,
@@ -81,15 +85,15 @@ async def get_config_dependency() -> AppConfig:
 
 
 @app.get("/logs")
-async def read_logs(limit: int = Query(500, ge=1, le=5000), storage: LogStorage = Depends(get_storage)) -> JSONResponse:
+async def read_logs(limit: int = Query(500, ge=1, le=5000), storage: LogStorage = Depends(get_storage)) -> ORJSONResponse:
     logs = await storage.get_recent(limit)
-    return JSONResponse(content={"logs": logs})
+    return ORJSONResponse(content={"logs": logs})
 
 
 @app.delete("/logs")
-async def clear_logs(storage: LogStorage = Depends(get_storage)) -> JSONResponse:
+async def clear_logs(storage: LogStorage = Depends(get_storage)) -> ORJSONResponse:
     await storage.clear_buffer()
-    return JSONResponse(content={"status": "ok", "message": "Buffer cleared"})
+    return ORJSONResponse(content={"status": "ok", "message": "Buffer cleared"})
 
 
 @app.websocket("/ws")
@@ -105,8 +109,13 @@ async def websocket_logs(
     queue = await storage.subscribe()
     try:
         while True:
-            entry = await queue.get()
-            await websocket.send_json(entry.to_dict())
+            batch = [(await queue.get()).as_json_bytes()]
+            try:
+                while len(batch) < WEBSOCKET_BATCH_SIZE:
+                    batch.append(queue.get_nowait().as_json_bytes())
+            except asyncio.QueueEmpty:
+                pass
+            await websocket.send_bytes(b"[" + b",".join(batch) + b"]")
     except WebSocketDisconnect:
         pass
     finally:
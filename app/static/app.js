@@ -19,6 +19,7 @@ let logs = [];
 let paused = false;
 let autoScroll = true;
 let reconnectDelay = 1000;
+const textDecoder = new TextDecoder();
 
 // Initialize application
 async function bootstrap() {
@@ -123,6 +124,7 @@ function connectWebSocket() {
     const query = token ? `?token=${encodeURIComponent(token)}` : '';
     const url = `${protocol}://${window.location.host}/ws${query}`;
     const socket = new WebSocket(url);
+    socket.binaryType = 'arraybuffer';
 
     socket.addEventListener('open', () => {
         connectionStatus.textContent = 'Connected';
@@ -130,10 +132,14 @@ function connectWebSocket() {
     });
 
     socket.addEventListener('message', (event) => {
-        const payload = JSON.parse(event.data);
-        pushLog(payload);
-        if (!paused) {
-            appendLog(payload);
+        // Each binary frame holds a UTF-8 encoded JSON array of entries
+        const data = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+        const entries = JSON.parse(data);
+        for (const entry of entries) {
+            pushLog(entry);
+            if (!paused) {
+                appendLog(entry);
+            }
         }
         updateLogCount();
     });
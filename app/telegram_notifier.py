@@ -1,15 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+import html
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import httpx
 
 from .config import AppConfig
 
+if TYPE_CHECKING:
+    from .log_storage import LogEntry
+
 logger = logging.getLogger(__name__)
 
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+# Queued entries are joined into one message up to this many characters,
+# leaving headroom below Telegram's 4096 character limit.
+TELEGRAM_BATCH_CHARS = 3900
+
 
 class TelegramNotifier:
     """Telegram bot notifier for sending log messages"""
@@ -20,7 +30,7 @@ class TelegramNotifier:
         self._bot_token = config.telegram_bot_token
         self._chat_id = config.telegram_chat_id
         self._client: Optional[httpx.AsyncClient] = None
-        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=100)
+        self._queue: asyncio.Queue[LogEntry] = asyncio.Queue(maxsize=100)
         self._worker_task: Optional[asyncio.Task] = None
 
         if self._enabled and not self._bot_token:
@@ -37,7 +47,13 @@ class TelegramNotifier:
             logger.info("Telegram notifier is disabled")
             return
 
-        self._client = httpx.AsyncClient(timeout=10.0)
+        # A single keep-alive HTTP/2 connection carries all Telegram traffic
+        self._client = httpx.AsyncClient(
+            base_url=TELEGRAM_API_URL,
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=1, max_connections=1, keepalive_expiry=60.0),
+        )
         self._worker_task = asyncio.create_task(self._worker())
         logger.info(f"Telegram notifier started for chat ID: {self._chat_id}")
 
@@ -54,22 +70,35 @@ class TelegramNotifier:
             await self._client.aclose()
             self._client = None
 
-    async def send_message(self, message: str) -> None:
-        """Queue a message to be sent to Telegram"""
+    def enqueue(self, entry: LogEntry) -> None:
+        """Queue a log entry to be sent to Telegram"""
         if not self._enabled:
             return
 
         try:
-            self._queue.put_nowait(message)
+            self._queue.put_nowait(entry)
         except asyncio.QueueFull:
             logger.warning("Telegram queue is full, dropping message")
 
     async def _worker(self) -> None:
         """Background worker that sends messages from the queue"""
+        carry: Optional[str] = None
         while True:
             try:
-                message = await self._queue.get()
-                await self._send_to_telegram(message)
+                if carry is None:
+                    carry = self._format_entry(await self._queue.get())
+                parts = [carry]
+                length = len(carry)
+                carry = None
+                # Coalesce whatever else is already queued into the same message
+                while not self._queue.empty():
+                    message = self._format_entry(self._queue.get_nowait())
+                    if length + 1 + len(message) > TELEGRAM_BATCH_CHARS:
+                        carry = message
+                        break
+                    parts.append(message)
+                    length += 1 + len(message)
+                await self._send_to_telegram("\n".join(parts))
                 # Rate limiting: wait a bit between messages
                 await asyncio.sleep(0.5)
             except asyncio.CancelledError:
@@ -78,16 +107,27 @@ class TelegramNotifier:
                 logger.error(f"Error in Telegram worker: {e}")
                 await asyncio.sleep(1)
 
+    @staticmethod
+    def _format_entry(entry: LogEntry) -> str:
+        """Format a log entry as a Telegram HTML message"""
+        # escaped so one line containing < or & cannot get a whole batch rejected
+        return f"<code>[{entry.iso_ts_short}]</code> {html.escape(entry.message)}"
+
     async def _send_to_telegram(self, message: str) -> None:
         """Send a message to Telegram via Bot API"""
         if not self._client:
             return
 
-        url = f"https://api.telegram.org/bot{self._bot_token}/sendMessage"
+        url = f"/bot{self._bot_token}/sendMessage"
         
         # Truncate message if too long (Telegram limit is 4096 characters)
         if len(message) > 4000:
-            message = message[:3997] + "..."
+            message = message[:3997]
+            # do not leave half of an escaped entity such as "&am" behind
+            amp = message.rfind("&")
+            if amp > message.rfind(";"):
+                message = message[:amp]
+            message += "..."
 
         payload = {
             "chat_id": self._chat_id,
@@ -103,3 +143,10 @@ class TelegramNotifier:
             logger.error(f"Failed to send message to Telegram: {e}")
         except Exception as e:
             logger.error(f"Unexpected error sending to Telegram: {e}")
+
+
+class NullTelegramNotifier:
+    """Notifier used when no Telegram notifier is configured; drops everything"""
+
+    def enqueue(self, entry: LogEntry) -> None:
+        return None
@@ -11,6 +11,7 @@ class UDPServerProtocol(asyncio.DatagramProtocol):
     def __init__(self, config: AppConfig, storage: LogStorage):
         self.config = config
         self.storage = storage
+        self._whitelist = frozenset(config.udp_whitelist)
         self.transport: Optional[asyncio.transports.DatagramTransport] = None
 
     def connection_made(self, transport: asyncio.transports.DatagramTransport) -> None:
@@ -18,14 +19,14 @@ class UDPServerProtocol(asyncio.DatagramProtocol):
 
     def datagram_received(self, data: bytes, addr) -> None:  # type: ignore[override]
         host, _ = addr
-        if self.config.udp_whitelist and host not in self.config.udp_whitelist:
+        if self._whitelist and host not in self._whitelist:
             return
         message = data.decode("utf-8", errors="replace")
         lines = message.splitlines() or [message]
         for line in lines:
             if not line:
                 continue
-            asyncio.create_task(self.storage.add_entry(line))
+            self.storage.enqueue(line)
 
 
 async def start_udp_server(config: AppConfig, storage: LogStorage) -> asyncio.transports.DatagramTransport: